@@ -5,7 +5,6 @@ from __future__ import annotations
 
 import html
 import json
-import re
 from pathlib import Path
 
 
@@ -24,8 +23,15 @@ def ul(items: list[str]) -> str:
 
 
 def set_div_content(html_text: str, div_id: str, content: str) -> str:
-    pattern = rf"(<div id=\"{re.escape(div_id)}\">)(.*?)(</div>)"
-    return re.sub(pattern, rf"\1{content}\3", html_text, flags=re.DOTALL)
+    opener = f'<div id="{div_id}">'
+    start = html_text.find(opener)
+    if start == -1:
+        return html_text
+    body_start = start + len(opener)
+    end = html_text.find("</div>", body_start)
+    if end == -1:
+        return html_text
+    return html_text[:body_start] + content + html_text[end:]
 
 
 def main() -> int:
@@ -53,27 +59,31 @@ def main() -> int:
 </ul>
 """.strip()
 
-    overview = "".join(
+    # Push fragments onto one list and join once at the end rather than
+    # concatenating intermediate strings.
+    detail_parts: list[str] = [
         f"<p>{html.escape(p)}</p>" for p in detail.get("overview_paragraphs", [])
-    )
-    narratives = []
-    for n in detail.get("contest_narratives", [])[:10]:
-        top = ", ".join(
-            f"{html.escape(str(c.get('county', '')))} ({party_margin(float(c.get('margin_pct', 0)))})"
-            for c in n.get("strongest_counties_latest", [])[:3]
-        )
-        narratives.append(
-            "<div style='margin-bottom:12px;padding-bottom:10px;border-bottom:1px solid #e5e7eb;'>"
-            f"<p style='margin:0 0 4px 0;'><strong>{html.escape(str(n.get('contest_type', '')))}</strong></p>"
-            f"<p style='margin:0 0 4px 0;'>{html.escape(str(n.get('description', '')))}</p>"
-            f"<p style='margin:0;color:#4b5563;'><em>Strongest recent counties:</em> {html.escape(top or 'N/A')}</p>"
-            "</div>"
-        )
-    detail_html = (
-        overview
-        + "<h6 style='margin:12px 0 6px 0;'>Contest Narratives</h6>"
-        + ("".join(narratives) if narratives else "<p>No detailed narratives available.</p>")
-    )
+    ]
+    detail_parts.append("<h6 style='margin:12px 0 6px 0;'>Contest Narratives</h6>")
+    narratives = detail.get("contest_narratives", [])[:10]
+    if narratives:
+        for n in narratives:
+            top = ", ".join(
+                f"{html.escape(str(c.get('county', '')))} ({party_margin(float(c.get('margin_pct', 0)))})"
+                for c in n.get("strongest_counties_latest", [])[:3]
+            )
+            detail_parts.extend(
+                (
+                    "<div style='margin-bottom:12px;padding-bottom:10px;border-bottom:1px solid #e5e7eb;'>",
+                    f"<p style='margin:0 0 4px 0;'><strong>{html.escape(str(n.get('contest_type', '')))}</strong></p>",
+                    f"<p style='margin:0 0 4px 0;'>{html.escape(str(n.get('description', '')))}</p>",
+                    f"<p style='margin:0;color:#4b5563;'><em>Strongest recent counties:</em> {html.escape(top or 'N/A')}</p>",
+                    "</div>",
+                )
+            )
+    else:
+        detail_parts.append("<p>No detailed narratives available.</p>")
+    detail_html = "".join(detail_parts)
 
     rep_items = [
         f"<li>{html.escape(str(r.get('county', '')))}: {party_margin(float(r.get('earliest_margin_pct', 0)))} -> {party_margin(float(r.get('latest_margin_pct', 0)))} ({float(r.get('shift_toward_dem_pct', 0)):.2f} toward DEM)</li>"
@@ -87,13 +97,15 @@ def main() -> int:
         f"<li><strong>{y.get('year', '')}:</strong> {html.escape(str(y.get('summary', '')))}</li>"
         for y in list(detail.get("year_summaries", []))[-8:][::-1]
     ]
-    year_html = (
-        "<h6 style='margin:0 0 6px 0;'>Largest Shifts Toward Republican</h6>"
-        + ul(rep_items)
-        + "<h6 style='margin:12px 0 6px 0;'>Largest Shifts Toward Democratic</h6>"
-        + ul(dem_items)
-        + "<h6 style='margin:12px 0 6px 0;'>Recent Year Summaries</h6>"
-        + ul(year_items)
+    year_html = "".join(
+        (
+            "<h6 style='margin:0 0 6px 0;'>Largest Shifts Toward Republican</h6>",
+            ul(rep_items),
+            "<h6 style='margin:12px 0 6px 0;'>Largest Shifts Toward Democratic</h6>",
+            ul(dem_items),
+            "<h6 style='margin:12px 0 6px 0;'>Recent Year Summaries</h6>",
+            ul(year_items),
+        )
     )
 
     index_html = set_div_content(index_html, "wv-research-findings-content", summary_html)
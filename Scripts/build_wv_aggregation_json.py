@@ -6,10 +6,17 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import mmap
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
+from functools import lru_cache
 from pathlib import Path
 
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
 OFFICE_MAP = {
     "PRESIDENT": ("president", "President of the United States"),
     "U.S. PRESIDENT": ("president", "President of the United States"),
@@ -65,19 +72,40 @@ COUNTY_ALIASES = {
     "pocohantas": "pocahontas",
 }
 
-
+# Deletes every ASCII char outside [a-z]; county names are ASCII.
+_NON_AZ_TABLE = str.maketrans(
+    "", "", "".join(chr(c) for c in range(128) if not ord("a") <= c <= ord("z"))
+)
+
+# Compiled once at import; these run once per CSV row in main().
+_WS_RE = re.compile(r"\s+")
+_COUNTY_SUFFIX_RE = re.compile(r"\s+COUNTY$", re.IGNORECASE)
+_MC_RE = re.compile(r"\bMc([a-z])")
+_APOS_RE = re.compile(r"\b(O')([a-z])")
+_ROMAN_RE = re.compile(r"\b(Ii|Iii|Iv|V|Vi|Vii|Viii|Ix|X)\b")
+_JR_RE = re.compile(r"\bJr\.?\b", re.IGNORECASE)
+_SR_RE = re.compile(r"\bSr\.?\b", re.IGNORECASE)
+_FN_COUNTY_RE = re.compile(r"__([a-z]+(?:_[a-z]+)*)__precinct(?:\.+csv)?$")
+_FN_YEAR_RE = re.compile(r"^(\d{4})")
+_YEAR_RE = re.compile(r"^\d{4}$")
+
+
+@lru_cache(maxsize=4096)
 def county_norm_token(v: str) -> str:
-    return re.sub(r"[^a-z]", "", (v or "").strip().lower())
+    return (v or "").lower().translate(_NON_AZ_TABLE)
 
 
+@lru_cache(maxsize=4096)
 def normalize_text(v: str) -> str:
-    return re.sub(r"\s+", " ", (v or "").strip()).upper()
+    return _WS_RE.sub(" ", (v or "").strip()).upper()
 
 
+@lru_cache(maxsize=4096)
 def normalize_office(v: str) -> str:
     return normalize_text(v).replace("  ", " ")
 
 
+@lru_cache(maxsize=4096)
 def normalize_party(v: str) -> str:
     p = normalize_text(v)
     if not p:
@@ -85,12 +113,14 @@ def normalize_party(v: str) -> str:
     return PARTY_MAP.get(p, p)
 
 
+@lru_cache(maxsize=4096)
 def normalize_county_name(v: str) -> str:
-    c = re.sub(r"\s+", " ", (v or "").strip())
-    c = re.sub(r"\s+COUNTY$", "", c, flags=re.IGNORECASE)
+    c = _WS_RE.sub(" ", (v or "").strip())
+    c = _COUNTY_SUFFIX_RE.sub("", c)
     return c
 
 
+@lru_cache(maxsize=4096)
 def display_county_name(v: str) -> str:
     c = normalize_county_name(v)
     if not c:
@@ -98,29 +128,67 @@ def display_county_name(v: str) -> str:
     if c.isupper():
         t = c.title()
         # Preserve Mc* capitalization in title-cased uppercase inputs.
-        t = re.sub(r"\bMc([a-z])", lambda m: "Mc" + m.group(1).upper(), t)
+        t = _MC_RE.sub(lambda m: "Mc" + m.group(1).upper(), t)
         return t
     return c
 
 
+@lru_cache(maxsize=4096)
 def county_key(v: str) -> str:
     return normalize_text(normalize_county_name(v))
 
 
 def infer_county_from_filename(path: Path) -> str:
     # e.g. 20221108__wv__general__barbour__precinct.csv
-    m = re.search(r"__([a-z]+(?:_[a-z]+)*)__precinct(?:\.+csv)?$", path.name.lower())
+    m = _FN_COUNTY_RE.search(path.name.lower())
     if not m:
         return ""
     return display_county_name(m.group(1).replace("_", " "))
 
 
-def extract_votes(row: dict[str, str]) -> int:
-    lowered = {(k or "").strip().lower(): (v or "") for k, v in row.items()}
-    for key in ("votes", "total votes", "total_votes"):
-        if key in lowered:
-            return to_int(str(lowered[key]))
-    return 0
+def iter_decoded_lines(fh):
+    """Yield decoded lines, memory-mapping the file when possible.
+
+    mmap lets the OS page the CSV in lazily instead of copying it through
+    the buffered reader; empty files and exotic filesystems fall back to
+    plain line iteration.
+    """
+    try:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        for line in fh:
+            yield line.decode("utf-8")
+        return
+    with mm:
+        for line in iter(mm.readline, b""):
+            yield line.decode("utf-8")
+
+
+def find_column(header: list[str], *names: str) -> int | None:
+    """Resolve a column index once per file instead of per row."""
+    for name in names:
+        try:
+            return header.index(name)
+        except ValueError:
+            continue
+    return None
+
+
+def cell(row: list[str], i: int | None) -> str:
+    return row[i] if i is not None and i < len(row) else ""
+
+
+_INTERNED: dict[str, str] = {}
+
+
+def intern_str(s: str) -> str:
+    """Reuse one str object per distinct normalized value.
+
+    The dedupe set and grouping dicts hold the same few parties, candidates,
+    and county keys millions of times across precinct files; sharing one str
+    per value shrinks memory and lets hashes be computed once.
+    """
+    return _INTERNED.setdefault(s, s)
 
 
 def load_county_lookup(path: Path) -> dict[str, str]:
@@ -155,27 +223,38 @@ def canonicalize_county_name(raw: str, county_lookup: dict[str, str]) -> str:
     return county_lookup.get(token, "")
 
 
+def make_county_canonicalizer(county_lookup: dict[str, str]):
+    """Close over the lookup so raw-name canonicalization can be cached."""
+
+    @lru_cache(maxsize=4096)
+    def canonicalize(raw: str) -> str:
+        return canonicalize_county_name(raw, county_lookup)
+
+    return canonicalize
+
+
+@lru_cache(maxsize=4096)
 def normalize_candidate_name(raw: str) -> str:
-    s = re.sub(r"\s+", " ", (raw or "").strip())
+    s = _WS_RE.sub(" ", (raw or "").strip())
     if not s:
         return ""
     t = s.lower().title()
     # Preserve common name patterns.
-    t = re.sub(r"\bMc([a-z])", lambda m: "Mc" + m.group(1).upper(), t)
-    t = re.sub(r"\b(O')([a-z])", lambda m: m.group(1) + m.group(2).upper(), t)
+    t = _MC_RE.sub(lambda m: "Mc" + m.group(1).upper(), t)
+    t = _APOS_RE.sub(lambda m: m.group(1) + m.group(2).upper(), t)
     # Roman numerals and suffixes.
-    t = re.sub(r"\b(Ii|Iii|Iv|V|Vi|Vii|Viii|Ix|X)\b", lambda m: m.group(0).upper(), t)
-    t = re.sub(r"\bJr\.?\b", "Jr.", t, flags=re.IGNORECASE)
-    t = re.sub(r"\bSr\.?\b", "Sr.", t, flags=re.IGNORECASE)
+    t = _ROMAN_RE.sub(lambda m: m.group(0).upper(), t)
+    t = _JR_RE.sub("Jr.", t)
+    t = _SR_RE.sub("Sr.", t)
     return t
 
 
 def infer_year_from_filename(path: Path) -> str:
-    m = re.match(r"^(\d{4})", path.name)
+    m = _FN_YEAR_RE.match(path.name)
     if m:
         return m.group(1)
     parent_year = path.parent.name
-    if re.match(r"^\d{4}$", parent_year):
+    if _YEAR_RE.match(parent_year):
         return parent_year
     raise ValueError(f"Cannot infer year from filename: {path}")
 
@@ -220,6 +299,7 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+@lru_cache(maxsize=8192)
 def to_int(v: str) -> int:
     v = (v or "").strip()
     if not v:
@@ -230,61 +310,69 @@ def to_int(v: str) -> int:
     return int(round(float(v)))
 
 
-def pick_top_candidate(entries: list[tuple[str, int]]) -> str:
-    if not entries:
-        return ""
-    return max(entries, key=lambda x: x[1])[0]
+# (label, code suffix, DEM color, REP color), strongest tier first.
+_COMPETITIVENESS_TIERS = (
+    ("Annihilation", "ANNIHILATION", "#08306b", "#67000d"),
+    ("Dominant", "DOMINANT", "#08519c", "#a50f15"),
+    ("Stronghold", "STRONGHOLD", "#3182bd", "#cb181d"),
+    ("Safe", "SAFE", "#6baed6", "#ef3b2c"),
+    ("Likely", "LIKELY", "#9ecae1", "#fb6a4a"),
+    ("Lean", "LEAN", "#c6dbef", "#fcae91"),
+    ("Tilt", "TILT", "#e1f5fe", "#fee8c8"),
+)
+
+# Sub-0.5 margins are labelled Tossup but still record which party led.
+_TOSSUP_BY_PARTY = {
+    party: {"category": "Tossup", "party": party, "code": "T_TOSSUP", "color": "#f7f7f7"}
+    for party in ("Democratic", "Republican", "Tossup")
+}
+
+
+def _build_competitiveness_lookup() -> dict[tuple[int, str], dict[str, str]]:
+    lookup: dict[tuple[int, str], dict[str, str]] = {}
+    for tier, (label, suffix, dem_color, rep_color) in enumerate(_COMPETITIVENESS_TIERS):
+        for prefix, party, color in (
+            ("D", "Democratic", dem_color),
+            ("R", "Republican", rep_color),
+        ):
+            lookup[(tier, prefix)] = {
+                "category": f"{label} {party}",
+                "party": party,
+                "code": f"{prefix}_{suffix}",
+                "color": color,
+            }
+    return lookup
+
+
+_COMPETITIVENESS_LOOKUP = _build_competitiveness_lookup()
 
 
 def compute_competitiveness(margin_pct: float) -> dict[str, str]:
     abs_margin = abs(margin_pct)
-    winner_party = "Democratic" if margin_pct > 0 else "Republican" if margin_pct < 0 else "Tie"
-    code_prefix = "D" if margin_pct > 0 else "R" if margin_pct < 0 else "T"
-
     if abs_margin >= 40:
-        category = f"Annihilation {winner_party}" if winner_party != "Tie" else "Tossup"
-        code = f"{code_prefix}_ANNIHILATION" if code_prefix != "T" else "T_TOSSUP"
-        color = "#08306b" if margin_pct > 0 else "#67000d" if margin_pct < 0 else "#f7f7f7"
+        tier = 0
     elif abs_margin >= 30:
-        category = f"Dominant {winner_party}" if winner_party != "Tie" else "Tossup"
-        code = f"{code_prefix}_DOMINANT" if code_prefix != "T" else "T_TOSSUP"
-        color = "#08519c" if margin_pct > 0 else "#a50f15" if margin_pct < 0 else "#f7f7f7"
+        tier = 1
     elif abs_margin >= 20:
-        category = f"Stronghold {winner_party}" if winner_party != "Tie" else "Tossup"
-        code = f"{code_prefix}_STRONGHOLD" if code_prefix != "T" else "T_TOSSUP"
-        color = "#3182bd" if margin_pct > 0 else "#cb181d" if margin_pct < 0 else "#f7f7f7"
+        tier = 2
     elif abs_margin >= 10:
-        category = f"Safe {winner_party}" if winner_party != "Tie" else "Tossup"
-        code = f"{code_prefix}_SAFE" if code_prefix != "T" else "T_TOSSUP"
-        color = "#6baed6" if margin_pct > 0 else "#ef3b2c" if margin_pct < 0 else "#f7f7f7"
+        tier = 3
     elif abs_margin > 5.5:
-        category = f"Likely {winner_party}" if winner_party != "Tie" else "Tossup"
-        code = f"{code_prefix}_LIKELY" if code_prefix != "T" else "T_TOSSUP"
-        color = "#9ecae1" if margin_pct > 0 else "#fb6a4a" if margin_pct < 0 else "#f7f7f7"
+        tier = 4
     elif abs_margin > 0.99:
-        category = f"Lean {winner_party}" if winner_party != "Tie" else "Tossup"
-        code = f"{code_prefix}_LEAN" if code_prefix != "T" else "T_TOSSUP"
-        color = "#c6dbef" if margin_pct > 0 else "#fcae91" if margin_pct < 0 else "#f7f7f7"
+        tier = 5
     elif abs_margin >= 0.5:
-        category = f"Tilt {winner_party}" if winner_party != "Tie" else "Tossup"
-        code = f"{code_prefix}_TILT" if code_prefix != "T" else "T_TOSSUP"
-        color = "#e1f5fe" if margin_pct > 0 else "#fee8c8" if margin_pct < 0 else "#f7f7f7"
+        tier = 6
     else:
-        category = "Tossup"
-        code = "T_TOSSUP"
-        color = "#f7f7f7"
-
-    return {
-        "category": category,
-        "party": winner_party if winner_party != "Tie" else "Tossup",
-        "code": code,
-        "color": color,
-    }
+        leader = "Democratic" if margin_pct > 0 else "Republican" if margin_pct < 0 else "Tossup"
+        return _TOSSUP_BY_PARTY[leader]
+    return _COMPETITIVENESS_LOOKUP[(tier, "D" if margin_pct > 0 else "R")]
 
 
 def main() -> int:
     args = parse_args()
     county_lookup = load_county_lookup(args.counties_geojson)
+    canonicalize = make_county_canonicalizer(county_lookup)
     if args.input is not None:
         input_paths = [args.input]
     else:
@@ -311,88 +399,141 @@ def main() -> int:
             f"No input files found. --input={args.input} --input-glob={args.input_glob}"
         )
 
-    # year -> contest_type -> county -> list[(party, candidate, votes)]
-    grouped_by_year: dict[str, dict[str, dict[str, list[tuple[str, str, int]]]]] = defaultdict(
-        lambda: defaultdict(lambda: defaultdict(list))
-    )
+    # (year, contest_type, county) -> {(party, candidate): [votes_sum, votes_max]}
+    # Votes are collapsed per candidate at ingest (a streaming groupby-sum);
+    # votes_max keeps the largest single row for top-candidate selection.
+    # A flat tuple key means one dict probe per insert instead of three
+    # nested defaultdict layers.
+    grouped: dict[tuple[str, str, str], dict[tuple[str, str], list[int]]] = {}
     # year -> contest_type -> contest display label
     contest_labels_by_year: dict[str, dict[str, str]] = defaultdict(dict)
     county_name_by_key: dict[str, str] = {}
-    seen_entries: set[tuple[str, str, str, str, str, int]] = set()
+    # Dedupe on the 64-bit hash of the row tuple rather than the tuple
+    # itself: collisions are astronomically unlikely at these cardinalities
+    # and the set shrinks from six str references per entry to one int.
+    seen_hashes: set[int] = set()
 
     for input_path in input_paths:
         if not input_path.exists():
             raise FileNotFoundError(f"Input not found: {input_path}")
         year = infer_year_from_filename(input_path)
-        with input_path.open("r", encoding="utf-8", newline="") as f:
-            for row in csv.DictReader(f):
-                county = (row.get("county") or "").strip()
+        with input_path.open("rb") as f:
+            reader = csv.reader(iter_decoded_lines(f))
+            header = [(h or "").strip().lower() for h in next(reader, [])]
+            i_county = find_column(header, "county")
+            i_office = find_column(header, "office")
+            i_party = find_column(header, "party")
+            i_candidate = find_column(header, "candidate")
+            i_votes = find_column(header, "votes", "total votes", "total_votes")
+            for row in reader:
+                # Filter on office first: rows for untracked offices are
+                # common and skipping them early avoids the more expensive
+                # county/candidate normalization below.
+                office = normalize_office(cell(row, i_office))
+                office_entry = OFFICE_MAP.get(office)
+                if office_entry is None:
+                    continue
+
+                county = cell(row, i_county).strip()
                 if not county:
                     county = infer_county_from_filename(input_path)
-                county = canonicalize_county_name(county, county_lookup)
-                office = normalize_office(row.get("office") or "")
-                party = normalize_party(row.get("party") or "")
-                candidate = normalize_candidate_name(row.get("candidate") or "")
-                votes = extract_votes(row)
-
+                county = canonicalize(county)
                 if not county:
                     # Skip rows where county cannot be inferred.
                     continue
-                if office not in OFFICE_MAP:
-                    continue
+
+                candidate = intern_str(normalize_candidate_name(cell(row, i_candidate)))
                 if not candidate:
                     continue
 
-                ckey = county_key(county)
+                party = intern_str(normalize_party(cell(row, i_party)))
+                votes = to_int(cell(row, i_votes))
+
+                ckey = intern_str(county_key(county))
                 if not ckey:
                     continue
                 county_name_by_key.setdefault(ckey, display_county_name(county))
 
-                contest_type, contest_name = OFFICE_MAP[office]
-                dedupe_key = (year, contest_type, ckey, party, candidate, votes)
-                if dedupe_key in seen_entries:
+                contest_type, contest_name = office_entry
+                dedupe_hash = hash((year, contest_type, ckey, party, candidate, votes))
+                if dedupe_hash in seen_hashes:
                     continue
-                seen_entries.add(dedupe_key)
+                seen_hashes.add(dedupe_hash)
                 contest_labels_by_year[year][contest_type] = contest_name
-                grouped_by_year[year][contest_type][ckey].append((party, candidate, votes))
-
-    results_by_year: dict[str, dict[str, dict[str, object]]] = {}
+                bucket = grouped.get((year, contest_type, ckey))
+                if bucket is None:
+                    bucket = grouped[(year, contest_type, ckey)] = {}
+                acc = bucket.setdefault((party, candidate), [0, -1])
+                acc[0] += votes
+                if votes > acc[1]:
+                    acc[1] = votes
+
+    # Decide which (year, contest) pairs survive the county-count filter up
+    # front so metadata can be written before any year's results are built.
+    contest_county_counts = Counter((year, contest_type) for year, contest_type, _ in grouped)
+
+    kept_contests_by_year: dict[str, list[str]] = {}
     all_contests: set[str] = set()
     years_with_data: list[int] = []
-    counties_seen: set[str] = set()
 
-    for year in sorted(grouped_by_year.keys()):
-        year_grouped = grouped_by_year[year]
-        if not year_grouped:
+    for year in sorted({year for year, _ in contest_county_counts}):
+        kept = sorted(
+            contest_type
+            for (y, contest_type), n_counties in contest_county_counts.items()
+            if y == year and n_counties >= args.min_counties_per_contest
+        )
+        if not kept:
             continue
+        kept_contests_by_year[year] = kept
+        years_with_data.append(int(year))
+        all_contests.update(kept)
+
+    kept_pairs = {
+        (year, contest_type)
+        for year, contests in kept_contests_by_year.items()
+        for contest_type in contests
+    }
+    counties_seen = {ckey for year, contest_type, ckey in grouped if (year, contest_type) in kept_pairs}
+
+    # All (year, contest) buckets share the same ~55 counties, so sort the
+    # display order once instead of per contest.
+    ordered_ckeys = sorted(county_name_by_key, key=lambda k: county_name_by_key[k])
+
+    def build_year_results(year: str) -> dict[str, dict[str, object]]:
         results_for_year: dict[str, dict[str, object]] = {}
 
-        for contest_type, county_rows in sorted(year_grouped.items()):
-            if len(county_rows) < args.min_counties_per_contest:
-                continue
+        for contest_type in kept_contests_by_year[year]:
             contest_name = contest_labels_by_year[year][contest_type]
             contest_key = f"{contest_type}_{year}"
             county_results: dict[str, dict[str, object]] = {}
 
-            for ckey in sorted(county_rows.keys(), key=lambda x: county_name_by_key.get(x, x)):
-                entries = county_rows[ckey]
+            for ckey in ordered_ckeys:
+                entries = grouped.get((year, contest_type, ckey))
+                if entries is None:
+                    continue
                 county = county_name_by_key.get(ckey, ckey.title())
-                counties_seen.add(ckey)
-                party_totals: dict[str, int] = defaultdict(int)
-                for party, _candidate, votes in entries:
-                    party_totals[party if party else "NONPARTISAN"] += votes
+                # One pass over entries: party totals, DEM/REP sums, and the
+                # top candidate per major party.
+                party_totals: dict[str, int] = {}
+                dem_votes = rep_votes = total_votes = 0
+                dem_top = rep_top = ("", -1)
+                for (party, cand), (votes_sum, votes_max) in entries.items():
+                    pkey = party if party else "NONPARTISAN"
+                    party_totals[pkey] = party_totals.get(pkey, 0) + votes_sum
+                    total_votes += votes_sum
+                    if party == "DEM":
+                        dem_votes += votes_sum
+                        if votes_max > dem_top[1]:
+                            dem_top = (cand, votes_max)
+                    elif party == "REP":
+                        rep_votes += votes_sum
+                        if votes_max > rep_top[1]:
+                            rep_top = (cand, votes_max)
 
-                dem_entries = [(cand, v) for party, cand, v in entries if party == "DEM"]
-                rep_entries = [(cand, v) for party, cand, v in entries if party == "REP"]
-
-                dem_votes = sum(v for _, v in dem_entries)
-                rep_votes = sum(v for _, v in rep_entries)
-                total_votes = sum(v for _p, _c, v in entries)
                 two_party_total = dem_votes + rep_votes
                 other_votes = max(0, total_votes - two_party_total)
-
-                dem_candidate = pick_top_candidate(dem_entries)
-                rep_candidate = pick_top_candidate(rep_entries)
+                dem_candidate = dem_top[0]
+                rep_candidate = rep_top[0]
 
                 margin = dem_votes - rep_votes
                 margin_pct = round((margin / two_party_total * 100.0), 2) if two_party_total else 0.0
@@ -428,25 +569,34 @@ def main() -> int:
                     "results": county_results,
                 }
             }
-            all_contests.add(contest_type)
-
-        if results_for_year:
-            years_with_data.append(int(year))
-            results_by_year[year] = results_for_year
-
-    output_obj = {
-        "metadata": {
-            "title": "West Virginia Election Results",
-            "years": sorted(years_with_data),
-            "contests": sorted(all_contests),
-            "counties_count": len(counties_seen),
-        },
-        "results_by_year": results_by_year,
+
+        return results_for_year
+
+    metadata = {
+        "title": "West Virginia Election Results",
+        "years": sorted(years_with_data),
+        "contests": sorted(all_contests),
+        "counties_count": len(counties_seen),
     }
 
+    def encode_json_fragment(obj: object) -> bytes:
+        # orjson encodes in C when available; otherwise fall back to stdlib.
+        if orjson is not None:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+    # Stream one year at a time so peak memory holds a single year's results
+    # rather than the whole output tree plus its serialized buffer.
     args.output.parent.mkdir(parents=True, exist_ok=True)
-    with args.output.open("w", encoding="utf-8") as f:
-        json.dump(output_obj, f, indent=2)
+    with args.output.open("wb") as f:
+        f.write(b'{\n"metadata": ')
+        f.write(encode_json_fragment(metadata))
+        f.write(b',\n"results_by_year": {')
+        for i, year in enumerate(kept_contests_by_year):
+            f.write(b",\n" if i else b"\n")
+            f.write(encode_json_fragment(year) + b": ")
+            f.write(encode_json_fragment(build_year_results(year)))
+        f.write(b"\n}\n}\n")
 
     print("Inputs:")
     for p in input_paths:
@@ -7,6 +7,8 @@ import argparse
 import csv
 import re
 from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
 
@@ -63,6 +65,12 @@ def find_latest_results_by_county() -> Path | None:
     return p if p.exists() else None
 
 
+# One alternation covers "Nth Congressional/Senatorial/plain District".
+_DISTRICT_RE = re.compile(
+    r"(\d+)(?:st|nd|rd|th)\s+(?:Congressional\s+|Senatorial\s+)?District", re.IGNORECASE
+)
+
+
 def normalize_office_and_district(contest: str) -> tuple[str, str]:
     contest = (contest or "").strip()
     if not contest:
@@ -71,32 +79,21 @@ def normalize_office_and_district(contest: str) -> tuple[str, str]:
     if contest.startswith("Amendment"):
         return contest, ""
 
-    head = contest
-    tail = ""
-    if "," in contest:
-        head, tail = [x.strip() for x in contest.split(",", 1)]
+    head, _, tail = contest.partition(",")
+    head = head.strip()
+    tail = tail.strip()
 
     office = OFFICE_MAP.get(head, head.title() if head.isupper() else head)
     district = ""
 
     if tail:
-        m = re.search(r"(\d+)(?:st|nd|rd|th)\s+Congressional District", tail, flags=re.I)
-        if m:
-            district = m.group(1)
-        else:
-            m = re.search(r"(\d+)(?:st|nd|rd|th)\s+Senatorial District", tail, flags=re.I)
-            if m:
-                district = m.group(1)
-            else:
-                m = re.search(r"(\d+)(?:st|nd|rd|th)\s+District", tail, flags=re.I)
-                if m:
-                    district = m.group(1)
-                else:
-                    district = tail
+        m = _DISTRICT_RE.search(tail)
+        district = m.group(1) if m else tail
 
     return office, district
 
 
+@lru_cache(maxsize=8192)
 def to_int(v: str) -> int:
     return int(round(float(v)))
 
@@ -114,52 +111,53 @@ def main() -> int:
     output = args.out or (Path("Data") / "openelections-data-wv" / year / default_name)
     output.parent.mkdir(parents=True, exist_ok=True)
 
-    rows_out: list[dict[str, str | int]] = []
+    # (county, office, district, party, candidate, votes) in output column order.
+    rows_out: list[tuple[str, str, str, str, str, int]] = []
+    append_row = rows_out.append
     aggregates: dict[tuple[str, str, str, str], int] = defaultdict(int)
 
     with input_csv.open("r", encoding="utf-8", newline="") as f:
-        for row in csv.DictReader(f):
-            office, district = normalize_office_and_district(row.get("contest", ""))
-            county = (row.get("county") or "").strip()
-            party = (row.get("party") or "").strip()
-            candidate = (row.get("candidate") or "").strip()
-            votes = to_int(row.get("votes", "0"))
+        reader = csv.reader(f)
+        header = [(h or "").strip().lower() for h in next(reader, [])]
+
+        def col(name: str) -> int | None:
+            try:
+                return header.index(name)
+            except ValueError:
+                return None
+
+        def cell(row: list[str], i: int | None) -> str:
+            return row[i] if i is not None and i < len(row) else ""
+
+        i_contest = col("contest")
+        i_county = col("county")
+        i_party = col("party")
+        i_candidate = col("candidate")
+        i_votes = col("votes")
+
+        for row in reader:
+            office, district = normalize_office_and_district(cell(row, i_contest))
+            county = cell(row, i_county).strip()
+            party = cell(row, i_party).strip()
+            candidate = cell(row, i_candidate).strip()
+            votes = to_int(cell(row, i_votes) or "0")
 
             if not office or not candidate:
                 continue
 
-            rows_out.append(
-                {
-                    "county": county,
-                    "office": office,
-                    "district": district,
-                    "party": party,
-                    "candidate": candidate,
-                    "votes": votes,
-                }
-            )
+            append_row((county, office, district, party, candidate, votes))
             aggregates[(office, district, party, candidate)] += votes
 
     if args.include_statewide:
         for (office, district, party, candidate), votes in aggregates.items():
-            rows_out.append(
-                {
-                    "county": "",
-                    "office": office,
-                    "district": district,
-                    "party": party,
-                    "candidate": candidate,
-                    "votes": votes,
-                }
-            )
-
-    rows_out.sort(key=lambda r: (str(r["office"]), str(r["district"]), str(r["candidate"]), str(r["county"])))
+            rows_out.append(("", office, district, party, candidate, votes))
+
+    # office, district, candidate, county — C-level key extraction.
+    rows_out.sort(key=itemgetter(1, 2, 4, 0))
 
     with output.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(
-            f, fieldnames=["county", "office", "district", "party", "candidate", "votes"]
-        )
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(["county", "office", "district", "party", "candidate", "votes"])
         writer.writerows(rows_out)
 
     print(f"Input: {input_csv}")
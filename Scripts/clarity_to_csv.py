@@ -6,8 +6,21 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
+from functools import lru_cache
+from itertools import chain, islice, zip_longest
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+try:
+    import ijson
+except ModuleNotFoundError:
+    ijson = None
 
 
 def parse_args() -> argparse.Namespace:
@@ -35,28 +48,98 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+STATE_FIELDS = [
+    "source",
+    "contest_key",
+    "contest_agg_id",
+    "category_key",
+    "category",
+    "contest",
+    "contest_total_votes",
+    "precincts_total",
+    "precincts_reporting",
+    "registered_voters",
+    "ballots_cast",
+    "candidate_index",
+    "candidate",
+    "party",
+    "votes",
+    "pct",
+    "winner_flag",
+    "choice_agg_id",
+    "crc",
+    "cro",
+]
+
+COUNTY_FIELDS = [
+    "contest_key",
+    "contest",
+    "category_key",
+    "category",
+    "county",
+    "county_eid",
+    "county_cid",
+    "county_precincts_total",
+    "county_precincts_reporting",
+    "county_total_votes",
+    "candidate_index",
+    "candidate",
+    "party",
+    "votes",
+    "pct",
+]
+
+
 def find_latest_clarity_dir(root: Path) -> Path | None:
     if not root.exists():
         return None
-    dirs = [p for p in root.iterdir() if p.is_dir()]
+    # DirEntry.stat() reuses metadata the OS already returned with the
+    # directory listing, avoiding one stat syscall per entry.
+    with os.scandir(root) as entries:
+        dirs = [e for e in entries if e.is_dir()]
     if not dirs:
         return None
-    return max(dirs, key=lambda p: p.stat().st_mtime)
+    return Path(max(dirs, key=lambda e: e.stat().st_mtime).path)
+
+
+@lru_cache(maxsize=8)
+def list_jsons(folder: str) -> tuple[Path, ...]:
+    return tuple(sorted(Path(folder).glob("*.json")))
 
 
 def pick_input_file(folder: Path, name_hint: str) -> Path | None:
-    candidates = sorted(folder.glob("*.json"))
-    filtered = [
-        p
-        for p in candidates
-        if name_hint in p.name.lower() and "summary-details" not in p.name.lower()
-    ]
-    return filtered[0] if filtered else None
+    # main() probes the same folder for several hints; the cached listing
+    # means the directory is scanned and sorted only once.
+    for p in list_jsons(str(folder)):
+        name = p.name.lower()
+        if name_hint in name and "summary-details" not in name:
+            return p
+    return None
 
 
 def load_json(path: Path) -> Any:
-    with path.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    data = path.read_bytes()
+    if orjson is not None:
+        # orjson parses bytes directly in C, skipping the utf-8 text layer.
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def iter_contests(path: Path) -> Iterator[dict[str, Any]]:
+    """Stream contest dicts from a details payload one element at a time.
+
+    details.json can run to hundreds of megabytes; ijson walks the Contests
+    array incrementally so memory stays flat and the first row is emitted
+    before the file has been fully read. Without ijson, fall back to parsing
+    the whole payload.
+    """
+    if ijson is not None:
+        with path.open("rb") as f:
+            for contest in ijson.items(f, "Contests.item"):
+                if isinstance(contest, dict):
+                    yield contest
+        return
+    yield from get_contests(load_json(path))
 
 
 def get_contests(payload: Any) -> list[dict[str, Any]]:
@@ -70,10 +153,8 @@ def get_contests(payload: Any) -> list[dict[str, Any]]:
     return []
 
 
-def nval(arr: Any, i: int) -> Any:
-    if isinstance(arr, list) and i < len(arr):
-        return arr[i]
-    return None
+def lane(arr: Any) -> list[Any]:
+    return arr if isinstance(arr, list) else []
 
 
 def build_contest_lookup(contests: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
@@ -86,8 +167,14 @@ def build_contest_lookup(contests: list[dict[str, Any]]) -> dict[str, dict[str,
     return lookup
 
 
-def flatten_state_contests(contests: list[dict[str, Any]], source_label: str) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
+def flatten_state_contests(
+    contests: list[dict[str, Any]], source_label: str
+) -> Iterator[tuple[Any, ...]]:
+    """Yield one tuple per candidate in STATE_FIELDS order.
+
+    Rows are assembled column-wise (padded per-candidate lists plus repeated
+    contest scalars) and zipped, avoiding a 20-key dict per row.
+    """
     for contest in contests:
         names = contest.get("CH", [])
         parties = contest.get("P", [])
@@ -98,50 +185,45 @@ def flatten_state_contests(contests: list[dict[str, Any]], source_label: str) ->
         crc = contest.get("CRC", [])
         cro = contest.get("CRO", [])
 
+        per_candidate = (names, parties, votes, pcts, wins, choice_agg, crc, cro)
         max_len = max(
-            len(names) if isinstance(names, list) else 0,
-            len(parties) if isinstance(parties, list) else 0,
-            len(votes) if isinstance(votes, list) else 0,
-            len(pcts) if isinstance(pcts, list) else 0,
-            len(wins) if isinstance(wins, list) else 0,
-            len(choice_agg) if isinstance(choice_agg, list) else 0,
-            len(crc) if isinstance(crc, list) else 0,
-            len(cro) if isinstance(cro, list) else 0,
-            1,
+            max((len(c) for c in per_candidate if isinstance(c, list)), default=0), 1
         )
 
-        for i in range(max_len):
-            rows.append(
-                {
-                    "source": source_label,
-                    "contest_key": contest.get("K"),
-                    "contest_agg_id": contest.get("AggID"),
-                    "category_key": contest.get("CATKEY"),
-                    "category": contest.get("CAT"),
-                    "contest": contest.get("C"),
-                    "contest_total_votes": contest.get("T"),
-                    "precincts_total": contest.get("TP"),
-                    "precincts_reporting": contest.get("PR"),
-                    "registered_voters": contest.get("regvoters"),
-                    "ballots_cast": contest.get("BC"),
-                    "candidate_index": i,
-                    "candidate": nval(names, i),
-                    "party": nval(parties, i),
-                    "votes": nval(votes, i),
-                    "pct": nval(pcts, i),
-                    "winner_flag": nval(wins, i),
-                    "choice_agg_id": nval(choice_agg, i),
-                    "crc": nval(crc, i),
-                    "cro": nval(cro, i),
-                }
-            )
-    return rows
+        def pad(arr: Any) -> list[Any]:
+            if not isinstance(arr, list):
+                return [None] * max_len
+            return arr + [None] * (max_len - len(arr))
+
+        columns = (
+            [source_label] * max_len,
+            [contest.get("K")] * max_len,
+            [contest.get("AggID")] * max_len,
+            [contest.get("CATKEY")] * max_len,
+            [contest.get("CAT")] * max_len,
+            [contest.get("C")] * max_len,
+            [contest.get("T")] * max_len,
+            [contest.get("TP")] * max_len,
+            [contest.get("PR")] * max_len,
+            [contest.get("regvoters")] * max_len,
+            [contest.get("BC")] * max_len,
+            list(range(max_len)),
+            pad(names),
+            pad(parties),
+            pad(votes),
+            pad(pcts),
+            pad(wins),
+            pad(choice_agg),
+            pad(crc),
+            pad(cro),
+        )
+        yield from zip(*columns)
 
 
 def flatten_county_contests(
-    details_contests: list[dict[str, Any]], contest_lookup: dict[str, dict[str, Any]]
-) -> list[dict[str, Any]]:
-    rows: list[dict[str, Any]] = []
+    details_contests: Iterable[dict[str, Any]], contest_lookup: dict[str, dict[str, Any]]
+) -> Iterator[tuple[Any, ...]]:
+    """Yield one tuple per county x candidate in COUNTY_FIELDS order."""
 
     for contest in details_contests:
         key = str(contest.get("K") or "")
@@ -151,60 +233,67 @@ def flatten_county_contests(
         category = meta.get("CAT", contest.get("CAT"))
         category_key = meta.get("CATKEY", contest.get("CATKEY"))
 
-        candidate_names = meta.get("CH", [])
-        candidate_parties = meta.get("P", []) if meta is not contest else []
-
-        county_names = contest.get("P", [])
-        county_votes = contest.get("V", [])
-        county_totals = contest.get("T", [])
-        county_eids = contest.get("Eid", [])
-        county_cids = contest.get("Cid", [])
-        county_px = contest.get("PX", [])
-        county_py = contest.get("PY", [])
-
-        county_len = len(county_names) if isinstance(county_names, list) else 0
-        for county_i in range(county_len):
-            county_name = nval(county_names, county_i)
-            vote_vector = nval(county_votes, county_i)
+        candidate_names = lane(meta.get("CH"))
+        candidate_parties = lane(meta.get("P")) if meta is not contest else []
+
+        county_names = lane(contest.get("P"))
+        county_votes = lane(contest.get("V"))
+        county_totals = lane(contest.get("T"))
+        county_eids = lane(contest.get("Eid"))
+        county_cids = lane(contest.get("Cid"))
+        county_px = lane(contest.get("PX"))
+        county_py = lane(contest.get("PY"))
+
+        # zip_longest walks the per-county lanes in C, padding short lanes
+        # with None; islice caps iteration at the county-name lane as before.
+        county_lanes = islice(
+            zip_longest(
+                county_names,
+                county_votes,
+                county_totals,
+                county_eids,
+                county_cids,
+                county_px,
+                county_py,
+            ),
+            len(county_names),
+        )
+        for county_name, vote_vector, county_total, eid, cid, px, py in county_lanes:
             if not isinstance(vote_vector, list):
                 vote_vector = []
 
-            county_total = nval(county_totals, county_i)
-            max_len = max(
-                len(vote_vector),
-                len(candidate_names) if isinstance(candidate_names, list) else 0,
-                len(candidate_parties) if isinstance(candidate_parties, list) else 0,
-                1,
-            )
+            # The total is loop-invariant; validate it once per county rather
+            # than per candidate.
+            county_total_ok = isinstance(county_total, (int, float)) and bool(county_total)
+
+            if vote_vector or candidate_names or candidate_parties:
+                candidate_lanes = zip_longest(vote_vector, candidate_names, candidate_parties)
+            else:
+                candidate_lanes = ((None, None, None),)
 
-            for cand_i in range(max_len):
-                votes = nval(vote_vector, cand_i)
+            for cand_i, (votes, cand_name, cand_party) in enumerate(candidate_lanes):
                 pct = None
-                if isinstance(votes, (int, float)) and isinstance(county_total, (int, float)) and county_total:
+                if county_total_ok and isinstance(votes, (int, float)):
                     pct = (votes / county_total) * 100
 
-                rows.append(
-                    {
-                        "contest_key": key,
-                        "contest": contest_name,
-                        "category_key": category_key,
-                        "category": category,
-                        "county": county_name,
-                        "county_eid": nval(county_eids, county_i),
-                        "county_cid": nval(county_cids, county_i),
-                        "county_precincts_total": nval(county_px, county_i),
-                        "county_precincts_reporting": nval(county_py, county_i),
-                        "county_total_votes": county_total,
-                        "candidate_index": cand_i,
-                        "candidate": nval(candidate_names, cand_i),
-                        "party": nval(candidate_parties, cand_i),
-                        "votes": votes,
-                        "pct": pct,
-                    }
+                yield (
+                    key,
+                    contest_name,
+                    category_key,
+                    category,
+                    county_name,
+                    eid,
+                    cid,
+                    px,
+                    py,
+                    county_total,
+                    cand_i,
+                    cand_name,
+                    cand_party,
+                    votes,
+                    pct,
                 )
 
-    return rows
-
 
 def main() -> int:
     args = parse_args()
@@ -225,35 +314,15 @@ def main() -> int:
             print(f"No summary/sum JSON files found in: {input_dir}")
             return 1
 
-        rows: list[dict[str, Any]] = []
+        sources: list[Iterator[tuple[Any, ...]]] = []
         if summary_file is not None:
-            rows.extend(flatten_state_contests(get_contests(load_json(summary_file)), "summary"))
+            sources.append(flatten_state_contests(get_contests(load_json(summary_file)), "summary"))
         if sum_file is not None:
-            rows.extend(flatten_state_contests(get_contests(load_json(sum_file)), "sum"))
+            sources.append(flatten_state_contests(get_contests(load_json(sum_file)), "sum"))
+        rows = chain.from_iterable(sources)
 
         output = args.output or (input_dir / "results_flat.csv")
-        fields = [
-            "source",
-            "contest_key",
-            "contest_agg_id",
-            "category_key",
-            "category",
-            "contest",
-            "contest_total_votes",
-            "precincts_total",
-            "precincts_reporting",
-            "registered_voters",
-            "ballots_cast",
-            "candidate_index",
-            "candidate",
-            "party",
-            "votes",
-            "pct",
-            "winner_flag",
-            "choice_agg_id",
-            "crc",
-            "cro",
-        ]
+        fields = STATE_FIELDS
     else:
         if details_file is None:
             print(f"No details JSON file found in: {input_dir}")
@@ -267,36 +336,30 @@ def main() -> int:
             for k, v in fallback.items():
                 contest_lookup.setdefault(k, v)
 
-        rows = flatten_county_contests(get_contests(load_json(details_file)), contest_lookup)
+        rows = flatten_county_contests(iter_contests(details_file), contest_lookup)
         output = args.output or (input_dir / "results_by_county.csv")
-        fields = [
-            "contest_key",
-            "contest",
-            "category_key",
-            "category",
-            "county",
-            "county_eid",
-            "county_cid",
-            "county_precincts_total",
-            "county_precincts_reporting",
-            "county_total_votes",
-            "candidate_index",
-            "candidate",
-            "party",
-            "votes",
-            "pct",
-        ]
+        fields = COUNTY_FIELDS
+
+    # Rows stream straight from the flatten generators to the writer, so the
+    # working set stays one row at a time; count them on the way through.
+    row_count = 0
+
+    def counted(row_iter: Iterator[tuple[Any, ...]]) -> Iterator[tuple[Any, ...]]:
+        nonlocal row_count
+        for row in row_iter:
+            row_count += 1
+            yield row
 
     output.parent.mkdir(parents=True, exist_ok=True)
     with output.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fields)
-        writer.writeheader()
-        writer.writerows(rows)
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        writer.writerows(counted(rows))
 
     print(f"Input dir: {input_dir}")
     print(f"Level: {args.level}")
     print(f"Wrote CSV: {output}")
-    print(f"Rows: {len(rows)}")
+    print(f"Rows: {row_count}")
     return 0
 
 
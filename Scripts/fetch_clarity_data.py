@@ -7,15 +7,40 @@ import argparse
 import hashlib
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
 from urllib.error import HTTPError, URLError
 from urllib.parse import urljoin, urlparse, urlunparse
 from urllib.request import Request, urlopen
 
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+try:
+    import requests
+except ModuleNotFoundError:
+    requests = None
+
+# Dedupe only needs a fast collision-resistant fingerprint, not SHA-2.
+try:
+    from blake3 import blake3 as _content_hasher
+
+    HASH_ALGO = "blake3"
+except ModuleNotFoundError:
+    _content_hasher = hashlib.blake2b
+    HASH_ALGO = "blake2b"
+
 USER_AGENT = "Mozilla/5.0 (compatible; WVRealignment/1.0; +https://example.local)"
 TIMEOUT = 20
+MAX_FETCH_WORKERS = 32
+# Stop probing an origin after this many non-JSON replies in a row; some
+# Clarity hosts answer every unknown path with an HTML 200.
+MAX_NONJSON_STREAK = 3
 
 KEYWORDS = (
     "api",
@@ -71,8 +96,67 @@ LANG_FILES = (
     "summary.json",
 )
 
+# Compiled once; these run against every fetched page/script body.
+_SCRIPT_SRC_RE = re.compile(r'<script[^>]+src="([^"]+)"', re.IGNORECASE)
+_QUOTED_PATH_RE = re.compile(r"""['"](/[^'"\\\s]{1,180})['"]""")
+_QUOTED_REL_RE = re.compile(r"""['"](api/[^'"\\\s]{1,180})['"]""")
+_BAD_EXT_RE = re.compile(r"\.(js|css|png|jpg|jpeg|svg|ico|map|woff2?|ttf|html)$")
+# One C-level scan instead of a Python substring test per keyword.
+_KEYWORD_RE = re.compile("|".join(map(re.escape, KEYWORDS)))
+_WEB_PATH_RE = re.compile(r"^(.*?/[^/]+/?)web\.[^/]+/$")
+_UNSAFE_CHARS_RE = re.compile(r"[^A-Za-z0-9._-]+")
+_CONFIG_KEY_RE = re.compile(
+    r"(?:apiUri|jsonUri|api_uri|json_uri)['\"]?\s*[:=]\s*['\"]([^'\"\\\s]+)['\"]"
+)
+
+
+@lru_cache(maxsize=256)
+def _parse(url: str):
+    """Cached urlparse; the same bases and probe URLs are parsed repeatedly."""
+    return urlparse(url)
+
+
+_session: "requests.Session | None" = None
+
+
+def get_session() -> "requests.Session":
+    """Shared keepalive session so probes reuse TCP+TLS connections."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers["User-Agent"] = USER_AGENT
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=MAX_FETCH_WORKERS
+        )
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+
+def fetch_many(urls: list[str]) -> list[tuple[int, bytes, str]]:
+    """Fetch independent URLs concurrently, preserving input order.
+
+    urllib releases the GIL during socket I/O, so a thread pool turns the
+    serial sum of round trips into roughly the slowest single response.
+    """
+    if len(urls) <= 1:
+        return [fetch_url(u) for u in urls]
+    with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(urls))) as ex:
+        return list(ex.map(fetch_url, urls))
+
 
 def fetch_url(url: str) -> tuple[int, bytes, str]:
+    if requests is not None:
+        try:
+            resp = get_session().get(url, timeout=TIMEOUT)
+        except requests.RequestException:
+            return 0, b"", ""
+        content_type = resp.headers.get("Content-Type", "")
+        if resp.status_code != 200:
+            return resp.status_code, b"", content_type
+        return resp.status_code, resp.content, content_type
+
+    # Fallback: one-shot urllib connection per request.
     req = Request(url, headers={"User-Agent": USER_AGENT})
     try:
         with urlopen(req, timeout=TIMEOUT) as resp:
@@ -90,13 +174,16 @@ def read_json(url: str) -> tuple[int, dict]:
     if status != 200 or not content:
         return status, {}
     try:
+        if orjson is not None:
+            return status, orjson.loads(content)
         return status, json.loads(content.decode("utf-8", errors="ignore"))
-    except json.JSONDecodeError:
+    except ValueError:
+        # Covers json.JSONDecodeError and orjson.JSONDecodeError alike.
         return status, {}
 
 
 def normalize_web_base(url: str) -> str:
-    p = urlparse(url)
+    p = _parse(url)
     path = p.path or "/"
     if not path.endswith("/"):
         path = path.rsplit("/", 1)[0] + "/"
@@ -104,8 +191,8 @@ def normalize_web_base(url: str) -> str:
 
 
 def election_root(web_base: str) -> str | None:
-    p = urlparse(web_base)
-    m = re.match(r"^(.*?/[^/]+/?)web\.[^/]+/$", p.path)
+    p = _parse(web_base)
+    m = _WEB_PATH_RE.match(p.path)
     if not m:
         return None
     root_path = m.group(1)
@@ -115,12 +202,12 @@ def election_root(web_base: str) -> str | None:
 
 
 def origin(url: str) -> str:
-    p = urlparse(url)
+    p = _parse(url)
     return f"{p.scheme}://{p.netloc}/"
 
 
 def extract_script_urls(index_html: str, web_base: str) -> list[str]:
-    srcs = re.findall(r'<script[^>]+src="([^"]+)"', index_html, flags=re.IGNORECASE)
+    srcs = _SCRIPT_SRC_RE.findall(index_html)
     urls = [urljoin(web_base, s) for s in srcs]
     return sorted(set(urls))
 
@@ -128,14 +215,14 @@ def extract_script_urls(index_html: str, web_base: str) -> list[str]:
 def extract_endpoint_candidates(js_text: str) -> list[str]:
     candidates: set[str] = set(KNOWN_ENDPOINTS)
 
-    quoted_paths = re.findall(r"""['"](/[^'"\\\s]{1,180})['"]""", js_text)
-    quoted_rel = re.findall(r"""['"](api/[^'"\\\s]{1,180})['"]""", js_text)
+    quoted_paths = _QUOTED_PATH_RE.findall(js_text)
+    quoted_rel = _QUOTED_REL_RE.findall(js_text)
 
     for item in quoted_paths + ["/" + x for x in quoted_rel]:
         lower = item.lower()
-        if not any(k in lower for k in KEYWORDS):
+        if not _KEYWORD_RE.search(lower):
             continue
-        if re.search(r"\.(js|css|png|jpg|jpeg|svg|ico|map|woff2?|ttf|html)$", lower):
+        if _BAD_EXT_RE.search(lower):
             continue
         candidates.add(item)
 
@@ -145,32 +232,32 @@ def extract_endpoint_candidates(js_text: str) -> list[str]:
 def likely_json(content: bytes, content_type: str) -> bool:
     if not content:
         return False
-    preview = content[:300].lstrip()
     ctype = content_type.lower()
+    # Fast path: a well-behaved server declared JSON; skip body inspection.
+    if ctype.startswith("application/json"):
+        return True
+    # Only the first few non-whitespace bytes matter for the prefix tests.
+    preview = content[:300].lstrip(b" \t\r\n")[:16]
     if "text/html" in ctype or preview.startswith(b"<!doctype html"):
         return False
     if "json" in ctype:
         return True
-    if preview.startswith((b"{", b"[")):
-        return True
-    if preview.startswith((b"var ", b"let ", b"const ")):
-        return True
-    return False
+    return preview.startswith((b"{", b"[", b"var ", b"let ", b"const "))
 
 
 def safe_slug(url: str) -> str:
-    p = urlparse(url)
+    p = _parse(url)
     combined = (p.netloc + p.path).strip("/").replace("/", "_")
-    combined = re.sub(r"[^A-Za-z0-9._-]+", "_", combined)
+    combined = _UNSAFE_CHARS_RE.sub("_", combined)
     return combined[:120] or "clarity"
 
 
 def save_payload(out_dir: Path, url: str, payload: bytes, ctype: str, seen_hashes: set[str], index: int) -> dict | None:
-    digest = hashlib.sha256(payload).hexdigest()
+    digest = _content_hasher(payload).hexdigest()
     if digest in seen_hashes:
         return None
     seen_hashes.add(digest)
-    name = re.sub(r"[^A-Za-z0-9._-]+", "_", urlparse(url).path.strip("/")) or "root"
+    name = _UNSAFE_CHARS_RE.sub("_", _parse(url).path.strip("/")) or "root"
     out_file = out_dir / f"{index:04d}_{name}.json"
     out_file.write_bytes(payload)
     return {
@@ -178,23 +265,27 @@ def save_payload(out_dir: Path, url: str, payload: bytes, ctype: str, seen_hashe
         "status": 200,
         "content_type": ctype,
         "file": str(out_file),
-        "sha256": digest,
+        "hash": digest,
+        "hash_algo": HASH_ALGO,
     }
 
 
 def build_probe_urls(base_urls: Iterable[str], endpoint_candidates: Iterable[str]) -> list[str]:
-    urls: set[str] = set()
+    # Keyed by a case/slash-insensitive form so the base x endpoint product
+    # does not probe the same resource twice under cosmetic variants.
+    urls: dict[str, str] = {}
     for base in base_urls:
         base = base if base.endswith("/") else base + "/"
         base_origin = origin(base)
         for ep in endpoint_candidates:
             if ep.startswith("http://") or ep.startswith("https://"):
-                urls.add(ep)
+                url = ep
             elif ep.startswith("/"):
-                urls.add(urljoin(base_origin, ep.lstrip("/")))
+                url = urljoin(base_origin, ep.lstrip("/"))
             else:
-                urls.add(urljoin(base, ep))
-    return sorted(urls)
+                url = urljoin(base, ep)
+            urls.setdefault(url.rstrip("/").lower(), url)
+    return sorted(urls.values())
 
 
 def deterministic_download(web_base: str, out_dir: Path, seen_hashes: set[str], start_index: int) -> tuple[int, list[dict], dict]:
@@ -247,8 +338,7 @@ def deterministic_download(web_base: str, out_dir: Path, seen_hashes: set[str],
         if lang:
             targets.append(f"{json_root}/{lang}/{fname}")
 
-    for target in targets:
-        s, content, ctype = fetch_url(target)
+    for target, (s, content, ctype) in zip(targets, fetch_many(targets)):
         if s != 200 or not likely_json(content, ctype):
             continue
         saved = save_payload(out_dir, target, content, ctype, seen_hashes, i)
@@ -288,15 +378,12 @@ def main() -> int:
     endpoint_candidates: set[str] = set(KNOWN_ENDPOINTS)
     discovered_config_values: set[str] = set()
 
-    for script_url in script_urls:
-        s, content, _ = fetch_url(script_url)
+    for script_url, (s, content, _ctype) in zip(script_urls, fetch_many(script_urls)):
         if s != 200 or not content:
             continue
         text = content.decode("utf-8", errors="ignore")
         endpoint_candidates.update(extract_endpoint_candidates(text))
-        for key in ("apiUri", "jsonUri", "api_uri", "json_uri"):
-            for match in re.findall(rf"{key}['\"]?\s*[:=]\s*['\"]([^'\"\\s]+)['\"]", text):
-                discovered_config_values.add(match)
+        discovered_config_values.update(_CONFIG_KEY_RE.findall(text))
 
     for v in sorted(discovered_config_values):
         if v.startswith("http://") or v.startswith("https://"):
@@ -327,17 +414,33 @@ def main() -> int:
     probe_urls = build_probe_urls(sorted(set(base_urls)), sorted(endpoint_candidates))
     manifest["probe_count"] = len(probe_urls)
 
-    for url in probe_urls:
-        status, content, ctype = fetch_url(url)
-        if status != 200 or not likely_json(content, ctype):
-            continue
-        saved = save_payload(out_dir, url, content, ctype, seen_hashes, idx)
-        if saved:
-            manifest["downloaded"].append(saved)
-            idx += 1
+    # Probes are independent; fetch them in parallel and keep the
+    # hash-dedupe and manifest writes on the main thread. Batching lets an
+    # origin that keeps answering with HTML error pages be dropped between
+    # batches instead of being probed to the end of the list.
+    nonjson_streak: dict[str, int] = {}
+    for start in range(0, len(probe_urls), MAX_FETCH_WORKERS):
+        batch = [
+            u
+            for u in probe_urls[start : start + MAX_FETCH_WORKERS]
+            if nonjson_streak.get(origin(u), 0) < MAX_NONJSON_STREAK
+        ]
+        for url, (status, content, ctype) in zip(batch, fetch_many(batch)):
+            if status != 200 or not likely_json(content, ctype):
+                nonjson_streak[origin(url)] = nonjson_streak.get(origin(url), 0) + 1
+                continue
+            nonjson_streak[origin(url)] = 0
+            saved = save_payload(out_dir, url, content, ctype, seen_hashes, idx)
+            if saved:
+                manifest["downloaded"].append(saved)
+                idx += 1
 
     manifest_path = out_dir / "manifest.json"
-    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    if orjson is not None:
+        # Encode straight to bytes; skips the intermediate str and re-encode.
+        manifest_path.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    else:
+        manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
 
     print(f"Deterministic files: {len(deterministic_files)}")
     print(f"Probe URLs: {len(probe_urls)}")
@@ -4,9 +4,17 @@
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
+import math
+from functools import lru_cache
 from pathlib import Path
-from statistics import pstdev
+from typing import Callable, Iterator, NamedTuple
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
 
 
 def parse_args() -> argparse.Namespace:
@@ -42,30 +50,100 @@ def parse_args() -> argparse.Namespace:
         default=None,
         help="Optional explicit year for latest snapshot; defaults to max year in data.",
     )
+    parser.add_argument(
+        "--skip-markdown",
+        action="store_true",
+        help="Write only the findings JSON; skip rendering the Markdown report.",
+    )
+    parser.add_argument(
+        "--skip-narratives",
+        action="store_true",
+        help="Omit contest narratives and year summaries from the detailed description.",
+    )
     return parser.parse_args()
 
 
 def load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def get_county_results_for_contest(
-    data: dict, year: int, contest_type: str
-) -> dict[str, dict]:
-    year_key = str(year)
-    year_block = data.get("results_by_year", {}).get(year_key, {})
-    contest_block = year_block.get(contest_type, {})
-    if not contest_block:
-        return {}
-    first_key = next(iter(contest_block.keys()))
-    return contest_block[first_key].get("results", {})
-
-
-def statewide_from_counties(counties: dict[str, dict]) -> dict[str, float]:
-    dem = sum(int(v.get("dem_votes", 0)) for v in counties.values())
-    rep = sum(int(v.get("rep_votes", 0)) for v in counties.values())
-    other = sum(int(v.get("other_votes", 0)) for v in counties.values())
-    total = sum(int(v.get("total_votes", 0)) for v in counties.values())
+    data = path.read_bytes()
+    if orjson is not None:
+        # orjson parses bytes directly in C, skipping the utf-8 text layer.
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class CountyRec(NamedTuple):
+    """Compact county record for the fields the findings builders read.
+
+    A NamedTuple costs a fraction of the source dict per record, and slot
+    access in the aggregation loops is faster than dict probes.
+    """
+
+    dem_votes: int
+    rep_votes: int
+    other_votes: int
+    total_votes: int
+    margin_pct: float
+    winner: str
+
+
+def normalize_county_records(data: dict) -> None:
+    """Replace county result dicts with CountyRec tuples, in place.
+
+    Vote fields are coerced to int once so the aggregation path reads
+    plain attributes instead of repeating .get plus int() per access.
+    """
+    for year_block in data.get("results_by_year", {}).values():
+        for contest_block in year_block.values():
+            for entry in contest_block.values():
+                results = entry.get("results", {})
+                for county, rec in results.items():
+                    results[county] = CountyRec(
+                        int(rec.get("dem_votes", 0) or 0),
+                        int(rec.get("rep_votes", 0) or 0),
+                        int(rec.get("other_votes", 0) or 0),
+                        int(rec.get("total_votes", 0) or 0),
+                        float(rec.get("margin_pct", 0.0)),
+                        rec.get("winner", "TIE"),
+                    )
+
+
+CountyLookup = Callable[[int, str], dict[str, CountyRec]]
+
+
+def make_contest_lookup(data: dict) -> CountyLookup:
+    """Return a memoized (year, contest) -> county-results lookup over data.
+
+    The same pairs are requested by the narrative, summary, volatility and
+    snapshot builders; caching makes every repeat access a dict probe.
+    """
+    # Re-key the year blocks by int once so lookups skip per-call str().
+    year_blocks: dict[int, dict] = {}
+    for year_key, block in data.get("results_by_year", {}).items():
+        try:
+            year_blocks[int(year_key)] = block
+        except ValueError:
+            continue
+
+    @lru_cache(maxsize=None)
+    def counties_for(year: int, contest_type: str) -> dict[str, CountyRec]:
+        contest_block = year_blocks.get(year, {}).get(contest_type, {})
+        if not contest_block:
+            return {}
+        first_key = next(iter(contest_block.keys()))
+        return contest_block[first_key].get("results", {})
+
+    return counties_for
+
+
+def statewide_from_counties(counties: dict[str, CountyRec]) -> dict[str, float]:
+    # One pass over the counties instead of four sum() generators; the
+    # fields are already ints via normalize_county_records.
+    dem = rep = other = total = 0
+    for v in counties.values():
+        dem += v.dem_votes
+        rep += v.rep_votes
+        other += v.other_votes
+        total += v.total_votes
     two_party = dem + rep
     margin = dem - rep
     margin_pct = round((margin / two_party * 100.0), 2) if two_party else 0.0
@@ -82,79 +160,117 @@ def statewide_from_counties(counties: dict[str, dict]) -> dict[str, float]:
     }
 
 
+StatewideLookup = Callable[[int, str], dict[str, float]]
+
+
+def make_statewide_lookup(counties_for: CountyLookup) -> StatewideLookup:
+    """Return a memoized (year, contest) -> statewide-aggregate lookup.
+
+    Narratives, year summaries and the presidential/snapshot loops all
+    aggregate the same pairs; caching leaves one O(counties) pass per pair.
+    """
+
+    @lru_cache(maxsize=None)
+    def statewide_for(year: int, contest_type: str) -> dict[str, float]:
+        return statewide_from_counties(counties_for(year, contest_type))
+
+    return statewide_for
+
+
 def sort_presidential_shifts(
-    earliest: dict[str, dict], latest: dict[str, dict]
+    earliest: dict[str, CountyRec], latest: dict[str, CountyRec]
 ) -> tuple[list[dict], list[dict]]:
-    shared = sorted(set(earliest.keys()) & set(latest.keys()))
+    # Dict key views support set ops directly; no intermediate set copies.
+    shared = sorted(earliest.keys() & latest.keys())
     shifts: list[dict] = []
     for county in shared:
-        e_margin = float(earliest[county].get("margin_pct", 0.0))
-        l_margin = float(latest[county].get("margin_pct", 0.0))
+        e_margin = earliest[county].margin_pct
+        l_margin = latest[county].margin_pct
         shifts.append(
             {
                 "county": county,
                 "earliest_margin_pct": round(e_margin, 2),
                 "latest_margin_pct": round(l_margin, 2),
+                "earliest_margin_str": fmt_margin(e_margin),
+                "latest_margin_str": fmt_margin(l_margin),
                 "shift_toward_dem_pct": round(l_margin - e_margin, 2),
             }
         )
-    shifts_dem = sorted(shifts, key=lambda x: x["shift_toward_dem_pct"], reverse=True)
-    shifts_rep = sorted(shifts, key=lambda x: x["shift_toward_dem_pct"])
-    return shifts_rep, shifts_dem
+    # One O(n log n) pass; the descending list is just the reversed view.
+    shifts.sort(key=lambda x: x["shift_toward_dem_pct"])
+    return shifts, shifts[::-1]
 
 
 def county_volatility_by_presidential_year(
-    data: dict, presidential_years: list[int]
+    counties_for: CountyLookup, presidential_years: list[int]
 ) -> list[dict]:
-    county_series: dict[str, list[float]] = {}
+    # Accumulate running (sum, sum of squares, count) per county so the
+    # stddev falls out of one pass, with no per-county margin lists and no
+    # second walk through statistics.pstdev's exact-arithmetic path.
+    county_stats: dict[str, list[float]] = {}
     for year in presidential_years:
-        counties = get_county_results_for_contest(data, year, "president")
+        counties = counties_for(year, "president")
         for county, rec in counties.items():
-            county_series.setdefault(county, []).append(float(rec.get("margin_pct", 0.0)))
+            m = rec.margin_pct
+            s = county_stats.get(county)
+            if s is None:
+                county_stats[county] = [m, m * m, 1]
+            else:
+                s[0] += m
+                s[1] += m * m
+                s[2] += 1
 
     out = []
-    for county, margins in county_series.items():
-        if len(margins) < 2:
+    for county, (total, total_sq, n) in county_stats.items():
+        if n < 2:
             continue
+        avg_margin = total / n
+        variance = max(0.0, total_sq / n - avg_margin * avg_margin)
         out.append(
             {
                 "county": county,
-                "n_elections": len(margins),
-                "margin_stddev": round(pstdev(margins), 2),
-                "avg_margin_pct": round(sum(margins) / len(margins), 2),
+                "n_elections": int(n),
+                "margin_stddev": round(math.sqrt(variance), 2),
+                "avg_margin_pct": round(avg_margin, 2),
+                "avg_margin_str": fmt_margin(avg_margin),
             }
         )
     return sorted(out, key=lambda x: x["margin_stddev"], reverse=True)
 
 
-def build_contest_narratives(data: dict, years: list[int], contests: list[str]) -> list[dict]:
+def build_contest_narratives(
+    counties_for: CountyLookup,
+    statewide_for: StatewideLookup,
+    contest_years: dict[str, list[int]],
+    contests: list[str],
+) -> list[dict]:
     out: list[dict] = []
     for contest in contests:
-        contest_years = [y for y in years if get_county_results_for_contest(data, y, contest)]
-        if not contest_years:
+        years_covered = contest_years.get(contest)
+        if not years_covered:
             continue
 
-        first_year = contest_years[0]
-        last_year = contest_years[-1]
-        first_state = statewide_from_counties(
-            get_county_results_for_contest(data, first_year, contest)
-        )
-        last_counties = get_county_results_for_contest(data, last_year, contest)
-        last_state = statewide_from_counties(last_counties)
+        first_year = years_covered[0]
+        last_year = years_covered[-1]
+        first_state = statewide_for(first_year, contest)
+        last_counties = counties_for(last_year, contest)
+        last_state = statewide_for(last_year, contest)
         shift = round(last_state["margin_pct"] - first_state["margin_pct"], 2)
 
-        strongest_latest = sorted(
-            [
+        # O(n log 5) selection instead of sorting every county.
+        strongest_latest = heapq.nlargest(
+            5,
+            (
                 {
                     "county": county,
-                    "winner": rec.get("winner", "TIE"),
-                    "margin_pct": float(rec.get("margin_pct", 0.0)),
+                    "winner": rec.winner,
+                    "margin_pct": rec.margin_pct,
+                    "margin_str": fmt_margin(rec.margin_pct),
                 }
                 for county, rec in last_counties.items()
-            ],
+            ),
             key=lambda x: abs(x["margin_pct"]),
-            reverse=True,
-        )[:5]
+        )
 
         trend_word = "toward Democrats" if shift > 0 else "toward Republicans" if shift < 0 else "flat"
         description = (
@@ -166,7 +282,7 @@ def build_contest_narratives(data: dict, years: list[int], contests: list[str])
         out.append(
             {
                 "contest_type": contest,
-                "years_covered": contest_years,
+                "years_covered": years_covered,
                 "first_year": first_year,
                 "last_year": last_year,
                 "first_statewide": first_state,
@@ -179,15 +295,17 @@ def build_contest_narratives(data: dict, years: list[int], contests: list[str])
     return out
 
 
-def build_year_summaries(data: dict, years: list[int]) -> list[dict]:
+def build_year_summaries(
+    year_contests: dict[int, list[str]], statewide_for: StatewideLookup, years: list[int]
+) -> list[dict]:
     out: list[dict] = []
     for year in years:
-        contests = sorted(data.get("results_by_year", {}).get(str(year), {}).keys())
+        contests = year_contests.get(year, [])
         if not contests:
             continue
         snapshots = []
         for contest in contests:
-            state = statewide_from_counties(get_county_results_for_contest(data, year, contest))
+            state = statewide_for(year, contest)
             snapshots.append(
                 {
                     "contest_type": contest,
@@ -195,9 +313,9 @@ def build_year_summaries(data: dict, years: list[int]) -> list[dict]:
                     "margin_pct": state["margin_pct"],
                 }
             )
-        snapshots_sorted = sorted(snapshots, key=lambda x: abs(x["margin_pct"]), reverse=True)
+        top_snapshots = heapq.nlargest(4, snapshots, key=lambda x: abs(x["margin_pct"]))
         overview = "; ".join(
-            [f"{s['contest_type']} {s['winner']} {fmt_margin(s['margin_pct'])}" for s in snapshots_sorted[:4]]
+            f"{s['contest_type']} {s['winner']} {fmt_margin(s['margin_pct'])}" for s in top_snapshots
         )
         out.append({"year": year, "contest_results": snapshots, "summary": overview})
     return out
@@ -208,114 +326,127 @@ def fmt_margin(value: float) -> str:
     return f"{party}{abs(value):.2f}"
 
 
-def build_markdown(findings: dict) -> str:
-    lines: list[str] = []
-    lines.append("# West Virginia Election Research Findings")
-    lines.append("")
-    lines.append(
-        f"- Coverage years: {findings['metadata']['years'][0]} to {findings['metadata']['years'][-1]}"
+def iter_markdown(findings: dict) -> Iterator[str]:
+    """Yield newline-terminated markdown chunks for writelines()."""
+    yield ("# West Virginia Election Research Findings\n")
+    yield ("\n")
+    yield (
+        f"- Coverage years: {findings['metadata']['years'][0]} to {findings['metadata']['years'][-1]}\n"
     )
-    lines.append(f"- Counties in dataset: {findings['metadata']['counties_count']}")
-    lines.append(f"- Contests: {', '.join(findings['metadata']['contests'])}")
-    lines.append("")
+    yield (f"- Counties in dataset: {findings['metadata']['counties_count']}\n")
+    yield (f"- Contests: {', '.join(findings['metadata']['contests'])}\n")
+    yield ("\n")
 
-    lines.append("## Key Findings")
-    lines.append(
+    yield ("## Key Findings\n")
+    yield (
         f"- Focus contest `{findings['focus_contest']}` shifted from "
         f"{fmt_margin(findings['focus_earliest_statewide']['margin_pct'])} in {findings['focus_earliest_year']} "
-        f"to {fmt_margin(findings['focus_latest_statewide']['margin_pct'])} in {findings['focus_latest_year']}."
+        f"to {fmt_margin(findings['focus_latest_statewide']['margin_pct'])} in {findings['focus_latest_year']}.\n"
     )
-    lines.append(
+    yield (
         f"- Net statewide movement toward Democrats across focus years: "
-        f"{findings['focus_statewide_shift_toward_dem_pct']:+.2f} points."
+        f"{findings['focus_statewide_shift_toward_dem_pct']:+.2f} points.\n"
     )
-    lines.append(
+    yield (
         f"- Latest presidential winner: {findings['latest_presidential_statewide']['winner']} "
-        f"({fmt_margin(findings['latest_presidential_statewide']['margin_pct'])})."
+        f"({fmt_margin(findings['latest_presidential_statewide']['margin_pct'])}).\n"
     )
-    lines.append("")
+    yield ("\n")
 
-    lines.append("## Presidential Statewide Trend")
-    lines.append("")
-    lines.append("| Year | Winner | Margin | DEM Votes | REP Votes |")
-    lines.append("|---|---|---:|---:|---:|")
+    yield ("## Presidential Statewide Trend\n")
+    yield ("\n")
+    yield ("| Year | Winner | Margin | DEM Votes | REP Votes |\n")
+    yield ("|---|---|---:|---:|---:|\n")
     for row in findings["presidential_statewide_by_year"]:
-        lines.append(
-            f"| {row['year']} | {row['winner']} | {fmt_margin(row['margin_pct'])} | "
-            f"{row['dem_votes']:,} | {row['rep_votes']:,} |"
+        yield (
+            f"| {row['year']} | {row['winner']} | {row['margin_str']} | "
+            f"{row['dem_votes']:,} | {row['rep_votes']:,} |\n"
         )
-    lines.append("")
+    yield ("\n")
 
-    lines.append("## Biggest County Shifts (Focus Contest)")
-    lines.append("")
-    lines.append("### Toward Republican")
+    yield ("## Biggest County Shifts (Focus Contest)\n")
+    yield ("\n")
+    yield ("### Toward Republican\n")
     for row in findings["top_shift_toward_republican"][:10]:
-        lines.append(
-            f"- {row['county']}: {fmt_margin(row['earliest_margin_pct'])} -> "
-            f"{fmt_margin(row['latest_margin_pct'])} "
-            f"({row['shift_toward_dem_pct']:+.2f} toward DEM)"
+        yield (
+            f"- {row['county']}: {row['earliest_margin_str']} -> "
+            f"{row['latest_margin_str']} "
+            f"({row['shift_toward_dem_pct']:+.2f} toward DEM)\n"
         )
-    lines.append("")
-    lines.append("### Toward Democratic")
+    yield ("\n")
+    yield ("### Toward Democratic\n")
     for row in findings["top_shift_toward_democratic"][:10]:
-        lines.append(
-            f"- {row['county']}: {fmt_margin(row['earliest_margin_pct'])} -> "
-            f"{fmt_margin(row['latest_margin_pct'])} "
-            f"({row['shift_toward_dem_pct']:+.2f} toward DEM)"
+        yield (
+            f"- {row['county']}: {row['earliest_margin_str']} -> "
+            f"{row['latest_margin_str']} "
+            f"({row['shift_toward_dem_pct']:+.2f} toward DEM)\n"
         )
-    lines.append("")
+    yield ("\n")
 
-    lines.append(f"## {findings['recent_year']} Snapshot By Contest")
+    yield (f"## {findings['recent_year']} Snapshot By Contest\n")
     for row in findings["recent_year_contest_snapshot"]:
-        lines.append(
-            f"- {row['contest_type']}: {row['winner']} {fmt_margin(row['margin_pct'])} "
-            f"(DEM {row['dem_votes']:,}, REP {row['rep_votes']:,})"
+        yield (
+            f"- {row['contest_type']}: {row['winner']} {row['margin_str']} "
+            f"(DEM {row['dem_votes']:,}, REP {row['rep_votes']:,})\n"
         )
-    lines.append("")
+    yield ("\n")
 
-    lines.append("## Most Volatile Counties (Presidential)")
+    yield ("## Most Volatile Counties (Presidential)\n")
     for row in findings["most_volatile_counties"][:10]:
-        lines.append(
+        yield (
             f"- {row['county']}: stdev {row['margin_stddev']:.2f}, "
-            f"average margin {fmt_margin(row['avg_margin_pct'])} "
-            f"across {row['n_elections']} elections"
+            f"average margin {row['avg_margin_str']} "
+            f"across {row['n_elections']} elections\n"
         )
-    lines.append("")
+    yield ("\n")
 
-    lines.append("## Detailed Description")
+    yield ("## Detailed Description\n")
     for paragraph in findings["detailed_description"]["overview_paragraphs"]:
-        lines.append(paragraph)
-        lines.append("")
+        yield (paragraph)
+        yield ("\n\n")
 
-    lines.append("### Contest Narratives")
+    yield ("### Contest Narratives\n")
     for item in findings["detailed_description"]["contest_narratives"]:
-        lines.append(
-            f"- {item['contest_type']}: {item['description']}"
-        )
+        yield (f"- {item['contest_type']}: {item['description']}\n")
         top = ", ".join(
-            [f"{c['county']} ({fmt_margin(c['margin_pct'])})" for c in item["strongest_counties_latest"][:3]]
+            f"{c['county']} ({c['margin_str']})" for c in item["strongest_counties_latest"][:3]
         )
         if top:
-            lines.append(f"  Latest strongest counties: {top}.")
-    lines.append("")
+            yield (f"  Latest strongest counties: {top}.\n")
+    yield ("\n")
 
-    lines.append("### Year-by-Year Highlights")
+    yield ("### Year-by-Year Highlights\n")
     for row in findings["detailed_description"]["year_summaries"]:
-        lines.append(f"- {row['year']}: {row['summary']}")
-    lines.append("")
-    return "\n".join(lines)
+        yield (f"- {row['year']}: {row['summary']}\n")
 
 
 def main() -> int:
     args = parse_args()
     data = load_json(args.input)
+    normalize_county_records(data)
     metadata = data.get("metadata", {})
     years = sorted(int(y) for y in metadata.get("years", []))
     if not years:
         raise ValueError("No years found in metadata.")
 
+    counties_for = make_contest_lookup(data)
+    statewide_for = make_statewide_lookup(counties_for)
+
+    # One presence pass over (year, contest); the builders and the filters
+    # below iterate these maps instead of re-probing every combination.
+    results_by_year = data.get("results_by_year", {})
+    year_keys = {y: str(y) for y in years}
+    year_contests: dict[int, list[str]] = {
+        y: sorted(c for c in results_by_year.get(year_keys[y], {}) if counties_for(y, c))
+        for y in years
+    }
+    contest_years: dict[str, list[int]] = {}
+    for y in years:
+        for c in year_contests[y]:
+            contest_years.setdefault(c, []).append(y)
+
     focus_contest = args.focus_contest
-    focus_years = [y for y in years if get_county_results_for_contest(data, y, focus_contest)]
+    focus_years = contest_years.get(focus_contest, [])
     if len(focus_years) < 2:
         raise ValueError(
             f"Need at least two years for contest '{focus_contest}'. Found: {focus_years}"
@@ -323,36 +454,48 @@ def main() -> int:
 
     focus_earliest_year = focus_years[0]
     focus_latest_year = focus_years[-1]
-    focus_earliest = get_county_results_for_contest(data, focus_earliest_year, focus_contest)
-    focus_latest = get_county_results_for_contest(data, focus_latest_year, focus_contest)
-    focus_earliest_statewide = statewide_from_counties(focus_earliest)
-    focus_latest_statewide = statewide_from_counties(focus_latest)
+    focus_earliest = counties_for(focus_earliest_year, focus_contest)
+    focus_latest = counties_for(focus_latest_year, focus_contest)
+    focus_earliest_statewide = statewide_for(focus_earliest_year, focus_contest)
+    focus_latest_statewide = statewide_for(focus_latest_year, focus_contest)
     focus_shift = round(
         focus_latest_statewide["margin_pct"] - focus_earliest_statewide["margin_pct"], 2
     )
     top_rep_shift, top_dem_shift = sort_presidential_shifts(focus_earliest, focus_latest)
 
-    presidential_years = [y for y in years if get_county_results_for_contest(data, y, "president")]
+    presidential_years = contest_years.get("president", [])
     presidential_statewide = []
     for y in presidential_years:
-        state = statewide_from_counties(get_county_results_for_contest(data, y, "president"))
-        presidential_statewide.append({"year": y, **state})
+        state = statewide_for(y, "president")
+        presidential_statewide.append(
+            {"year": y, **state, "margin_str": fmt_margin(state["margin_pct"])}
+        )
 
     recent_year = args.recent_year if args.recent_year else years[-1]
-    recent_contests = sorted(data.get("results_by_year", {}).get(str(recent_year), {}).keys())
+    recent_contests = year_contests.get(recent_year) or sorted(
+        results_by_year.get(str(recent_year), {}).keys()
+    )
     recent_snapshot = []
     for contest in recent_contests:
-        state = statewide_from_counties(get_county_results_for_contest(data, recent_year, contest))
-        recent_snapshot.append({"contest_type": contest, **state})
+        state = statewide_for(recent_year, contest)
+        recent_snapshot.append(
+            {"contest_type": contest, **state, "margin_str": fmt_margin(state["margin_pct"])}
+        )
 
     latest_pres_state = {}
     if presidential_years:
-        latest_pres_state = statewide_from_counties(
-            get_county_results_for_contest(data, presidential_years[-1], "president")
+        latest_pres_state = statewide_for(presidential_years[-1], "president")
+
+    # Pipelines that only consume the top-level JSON fields can skip the
+    # narrative and summary builders entirely.
+    if args.skip_narratives:
+        contest_narratives: list[dict] = []
+        year_summaries: list[dict] = []
+    else:
+        contest_narratives = build_contest_narratives(
+            counties_for, statewide_for, contest_years, metadata.get("contests", [])
         )
-
-    contest_narratives = build_contest_narratives(data, years, metadata.get("contests", []))
-    year_summaries = build_year_summaries(data, years)
+        year_summaries = build_year_summaries(year_contests, statewide_for, years)
     overview_paragraphs = [
         (
             f"This WV-focused dataset covers {years[0]} through {years[-1]} with county-level "
@@ -387,7 +530,9 @@ def main() -> int:
         "top_shift_toward_democratic": top_dem_shift,
         "recent_year": recent_year,
         "recent_year_contest_snapshot": recent_snapshot,
-        "most_volatile_counties": county_volatility_by_presidential_year(data, presidential_years),
+        "most_volatile_counties": county_volatility_by_presidential_year(
+            counties_for, presidential_years
+        ),
         "detailed_description": {
             "overview_paragraphs": overview_paragraphs,
             "contest_narratives": contest_narratives,
@@ -396,15 +541,25 @@ def main() -> int:
     }
 
     args.output_json.parent.mkdir(parents=True, exist_ok=True)
-    args.output_json.write_text(json.dumps(findings, indent=2), encoding="utf-8")
-
-    md = build_markdown(findings)
-    args.output_md.parent.mkdir(parents=True, exist_ok=True)
-    args.output_md.write_text(md, encoding="utf-8")
+    # A wide buffer keeps the write to a handful of syscalls; the fallback
+    # streams via json.dump instead of building one giant document string.
+    if orjson is not None:
+        with open(args.output_json, "wb", buffering=1024 * 1024) as f:
+            f.write(orjson.dumps(findings, option=orjson.OPT_INDENT_2))
+    else:
+        with open(args.output_json, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+            json.dump(findings, f, indent=2)
+
+    if not args.skip_markdown:
+        args.output_md.parent.mkdir(parents=True, exist_ok=True)
+        # Stream chunks straight to the file; no intermediate document string.
+        with args.output_md.open("w", encoding="utf-8") as f:
+            f.writelines(iter_markdown(findings))
 
     print(f"Input: {args.input}")
     print(f"Output JSON: {args.output_json}")
-    print(f"Output Markdown: {args.output_md}")
+    if not args.skip_markdown:
+        print(f"Output Markdown: {args.output_md}")
     print(f"Focus contest: {focus_contest}")
     print(f"Years analyzed: {years[0]}-{years[-1]}")
     return 0
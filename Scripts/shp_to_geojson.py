@@ -17,6 +17,17 @@ except ModuleNotFoundError:
     )
     raise
 
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+
+def encode_json(obj: dict | list) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Convert a .shp file to GeoJSON.")
@@ -45,12 +56,22 @@ def main() -> int:
     output.parent.mkdir(parents=True, exist_ok=True)
 
     reader = shapefile.Reader(str(input_shp))
-    feature_collection = reader.__geo_interface__
 
-    with output.open("w", encoding="utf-8") as f:
-        json.dump(feature_collection, f)
+    # Stream one feature at a time: reader.__geo_interface__ would build the
+    # entire FeatureCollection in memory before a single byte is written.
+    count = 0
+    with output.open("wb") as f:
+        f.write(b'{"type":"FeatureCollection","bbox":')
+        f.write(encode_json(list(reader.bbox)))
+        f.write(b',"features":[')
+        for sr in reader.iterShapeRecords():
+            if count:
+                f.write(b",")
+            f.write(encode_json(sr.__geo_interface__))
+            count += 1
+        f.write(b"]}")
 
-    print(f"Wrote GeoJSON: {output}")
+    print(f"Wrote GeoJSON: {output} ({count} features)")
     return 0
 
 